@@ -6,13 +6,18 @@ from datetime import datetime, date, timedelta
 from models.abstract import inputs
 from models.openai_env import OptionEnv
 from models.baseline_tfa_dqn import TFAModel
+# from models.batched import BatchedOption, bs_price_and_greeks # for the disabled NASDAQ tab
 from option_types import MODELS, USOption, EUOption, ASOption
 
 from polygon import Polygon
 from utils.tickers import read_tickers
 from utils.db_wrapper import read_rows_of_ticker
 
-POLYGON = Polygon(yf_backup=True)
+@st.cache_resource
+def get_polygon():
+    return Polygon(yf_backup=True)
+
+POLYGON = get_polygon()
 
 @st.cache_data
 def get_tickers():
@@ -30,6 +35,17 @@ def check_nasdaq_status():
 def pull_close_prices():
     return POLYGON.last_ticker_prices()
 
+@st.cache_resource
+def get_trained_model(params, n_iterations, eval_interval, log_interval):
+    tfa = TFAModel(OptionEnv, params, iterations=n_iterations, eval_interval=eval_interval, log_interval=log_interval)
+    st.write("Initializing Agent...")
+    tfa.init_agent()
+    st.write("Done | Building Replay Buffer...")
+    tfa.build_replay_buffer()
+    st.write("Done | Preparing to Train...")
+    tfa.train()
+    return tfa
+
 @st.cache_data
 def get_custom_defaults():
     defaults = {
@@ -69,27 +85,41 @@ with nasdaq:
 
     if True: #NASDAQ_STATUS == "open":
         st.info("Unfortunately due to changes made to how yahoo_fin scrapes options data (specifically expiration dates) we are currently unable to showcase this part of the app. We are currently working on a replacement library as you read this :).")
+        # @st.cache_data(ttl=timedelta(hours=1))
+        # def get_expiration_dates(ticker):
+        #     return POLYGON.expiration_dates(ticker)
+
+        # @st.cache_data(ttl=timedelta(hours=1))
+        # def get_ticker_contracts(ticker, expiration):
+        #     return POLYGON.get_ticker_contracts_given_exp(ticker, expiration=expiration)
+
         # with st.form("nasdaq-price"):
         #     cola, colb = st.columns(2)
         #     ticker = cola.selectbox("Underlying Ticker", ALL_TICKERS)
-        #     maturity = colb.selectbox("Expiration Date", POLYGON.expiration_dates(ticker))
+        #     maturity = colb.selectbox("Expiration Date", get_expiration_dates(ticker))
         #     maturity = datetime.strptime(maturity, '%B %d, %Y').date()
+        #     time_to_maturity = (maturity - date.today()) / timedelta(days=365)
         #     submit = st.form_submit_button("Update Contract Table", use_container_width=True)
 
         #     if submit:
-        #         ticker_contracts = POLYGON.get_ticker_contracts_given_exp(ticker, expiration=maturity)
+        #         ticker_contracts = get_ticker_contracts(ticker, maturity).set_index("Contract ID", drop=False)
                 
         #         ticker_contracts["spot"] = EOD_PRICES[ticker]
+        #         batch = BatchedOption.from_contracts(ticker_contracts, EOD_PRICES[ticker], time_to_maturity, 
+        #                                              DEFAULTS["risk_free_rate"], 0.02)
+        #         ticker_contracts[["BS Value", "Delta", "Gamma", "Vega", "Theta", "Rho"]] = bs_price_and_greeks(batch)
         #         st.dataframe(ticker_contracts, hide_index=True, use_container_width=True,
         #                     column_order=("Contract ID", "Contract Name", "Type", "spot", 
-        #                                 "Strike", "Mark", "Implied Volatility", "Last Trade Date",
-        #                                 "Last Price", "Bid", "Ask", "Open Interest"),
+        #                                 "Strike", "Mark", "BS Value", "Implied Volatility", "Last Trade Date",
+        #                                 "Last Price", "Bid", "Ask", "Open Interest",
+        #                                 "Delta", "Gamma", "Vega", "Theta", "Rho"),
         #                     column_config={
         #             "Contract Name": "Full Ticker",
         #             "Type": "Call/Put",
         #             "spot": st.column_config.NumberColumn("Spot Price", format="$%.2f"),
         #             "Strike": st.column_config.NumberColumn("Strike", format="$%.2f"),
         #             "Mark": st.column_config.NumberColumn("Mark (Mid)", format="$%.2f"),
+        #             "BS Value": st.column_config.NumberColumn("Black Scholes Value", format="$%.2f"),
         #             "Last Trade Date": "Last Trade Date",
         #             "Last Price": st.column_config.NumberColumn("Last Trade Price", format="$%.2f"),
         #             "Bid": st.column_config.NumberColumn("Bid", format="$%.2f"),
@@ -100,14 +130,14 @@ with nasdaq:
         #             cola, colb = st.columns(2)
         #             opt_id = colb.selectbox("Contract ID", ticker_contracts["Contract ID"])
         #             model = cola.selectbox("Model", MODELS["us"])
-        #             contract = ticker_contracts.loc[ticker_contracts['Contract ID'] == opt_id].to_dict('records')[0]
+        #             contract = ticker_contracts.loc[[opt_id]].iloc[0].to_dict() # ids are random, so may repeat
         #             submittwo = st.form_submit_button("Calculate Fair Value", use_container_width=True)
                     
         #         if submittwo:
         #             model_name = "all models" if model == "All Models" else f"a {model} model"
         #             opt = USOption(option_type=contract["Type"],
         #                 strike=contract["Strike"], spot=EOD_PRICES[ticker], 
-        #                 maturity=maturity, 
+        #                 maturity=maturity, time_to_maturity=time_to_maturity,
         #                 implied_volatility=float(contract["Implied Volatility"][:-1].replace(",","")) / 100,
         #                 risk_free_rate=DEFAULTS["risk_free_rate"],
         #                 dividend_rate=0.02)
@@ -227,20 +257,14 @@ with dqn:
         st.error("Evaluation and Log Intervals must be less than the total number of iterations")
     elif go:
         st.subheader("Model")
-        tfa = TFAModel(OptionEnv, test_defs, iterations=n_iterations, eval_interval=eval_interval, log_interval=log_interval, n_sims=n_sims)
         with st.status("Building Model...", expanded=True) as status:
-            st.write("Initializing Agent...")
-            tfa.init_agent()
-            st.write("Done | Building Replay Buffer...")
-            tfa.build_replay_buffer()
-            st.write("Done | Preparing to Train...")
-            tfa.train()
+            tfa = get_trained_model(test_defs, n_iterations, eval_interval, log_interval)
             status.update(label="Model Built - Pricing Option", state="running", expanded=True)
-            tfa.calculate_npv()
+            npv = tfa.calculate_npv(n_sims=n_sims)
             status.update(label="Option Pricing Complete", state="complete", expanded=False)
         
         st.divider()
-        tfa.st_visualize()
+        tfa.st_visualize(npv)
 
 # with pull:
 #     with st.form("tmp_pull"):
@@ -1,23 +1,36 @@
 # Abstract Option Class
+import numpy as np
 import streamlit as st
 
 from abc import ABC, abstractmethod
 from datetime import date, timedelta
-from torch import tensor
+from torch import autograd, float32, tensor
 
 class BaseOption(ABC):
     def __init__(self, params, with_tensors=False):
         try:
+            params = dict(params) # callers share one kwargs dict across every model they price
             self._maturity = params["maturity"]
-            params["time"] = (self._maturity - date.today()) / timedelta(days=365)
+            if "time_to_maturity" in params: # already in years, e.g. computed once per form submission
+                params["time"] = params["time_to_maturity"]
+            else:
+                params["time"] = (self._maturity - date.today()) / timedelta(days=365)
             self._option_type = params["option_type"]
+            self._flag = np.int8(1 if self._option_type == "C" else -1)
 
             self._spot = params["spot"]
             self._strike = params["strike"]
-            self._time = tensor(params["time"], requires_grad=True) if with_tensors else params["time"]
+            self._time = params["time"]
             self._iv = params["implied_volatility"]
             self._r = params["risk_free_rate"]
             self._d = params["dividend_rate"]
+
+            if with_tensors:
+                # a single leaf backs every input, so one backward pass yields all the greeks.
+                # float32 matches torch's default dtype, so the pricers' tensors never get promoted to float64
+                self._inputs = tensor([self._spot, self._strike, self._time, self._iv, self._r, self._d], 
+                                      dtype=float32, requires_grad=True)
+                self._spot, self._strike, self._time, self._iv, self._r, self._d = self._inputs.unbind()
         except Exception as e:
             msg = f"<Option> Missing Params - {e} - All Params: {params}"
             custom_msg = None
@@ -62,11 +75,6 @@ class Model(BaseOption):
         self._name = name
 
         try:
-            if with_tensors:
-                params = {k: (tensor(v, requires_grad=True) 
-                              if k not in ("option_type", "maturity") else v) 
-                              for k, v in params.items()}
-
             super().__init__(params, with_tensors=with_tensors)
 
         except Exception as e:
@@ -83,6 +91,15 @@ class Model(BaseOption):
     def st_visualize(self):
         raise NotImplementedError()
 
+    def _tensor_greeks(self, npv):
+        spot, _, time, iv, r, _ = autograd.grad(npv, self._inputs)[0]
+        return {
+            "delta": spot,
+            "rho": r,
+            "vega": iv,
+            "theta": time,
+        }
+
     def __str__(self):
         return f"Option Price ({self._name} Model): ${self.npv}"
 
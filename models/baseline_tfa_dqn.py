@@ -1,18 +1,29 @@
-import tensorflow as tf
+import threading
 import streamlit as st
 import pandas as pd
 from models.monte_carlo import dqn_sim
 
-from tf_agents.environments import  gym_wrapper           # wrap OpenAI gym
-from tf_agents.environments import tf_py_environment      # gym to tf gym
-from tf_agents.networks import q_network                  # Q net
-from tf_agents.agents.dqn import dqn_agent                # DQN Agent
-from tf_agents.replay_buffers import tf_uniform_replay_buffer      # replay buffer
-from tf_agents.trajectories import trajectory              # s->s' trajectory
-from tf_agents.utils import common                       # loss function
-
 from models.abstract import Model
 
+tf = None
+gym_wrapper = tf_py_environment = q_network = dqn_agent = None
+tf_uniform_replay_buffer = trajectory = common = None
+
+def _lazy_import():
+    # tensorflow + tf_agents take seconds to import, so only pay for them once a DQN is actually built
+    global tf, gym_wrapper, tf_py_environment, q_network, dqn_agent, tf_uniform_replay_buffer, trajectory, common
+    if tf is not None:
+        return
+
+    import tensorflow as tf
+    from tf_agents.environments import  gym_wrapper           # wrap OpenAI gym
+    from tf_agents.environments import tf_py_environment      # gym to tf gym
+    from tf_agents.networks import q_network                  # Q net
+    from tf_agents.agents.dqn import dqn_agent                # DQN Agent
+    from tf_agents.replay_buffers import tf_uniform_replay_buffer      # replay buffer
+    from tf_agents.trajectories import trajectory              # s->s' trajectory
+    from tf_agents.utils import common                       # loss function
+
 
 class TFAModel(Model):
     def __init__(self, 
@@ -29,6 +40,7 @@ class TFAModel(Model):
                  debugging = False,
                  n_sims: int = 10
                  ): # hyperparameters
+        _lazy_import()
         
         self._debugging = debugging
 
@@ -47,8 +59,10 @@ class TFAModel(Model):
         self._agent, self._repl_buffer = None, None
         self._log, self._returns = None, None
         self._npv = None
+        self._log_fh = None
         self._n_sims = n_sims
         self._priced = False
+        self._sim_lock = threading.Lock()
         
     def _setup_envs(self, env, params):
         train_gym, eval_gym = env(params), env(params)
@@ -88,7 +102,10 @@ class TFAModel(Model):
         buffer.add_batch(trj)
     
     def _collect_data(self, env, policy, buffer, steps):
-        (self._collect_step(env, policy, buffer) for _ in range(steps))
+        for n in range(steps):
+            if self._debugging:
+                self._log_fh.write(f"collecting [step = {n}] ...\n")
+            self._collect_step(env, policy, buffer)
     
     def build_replay_buffer(self):
         if self._agent is None:
@@ -108,11 +125,7 @@ class TFAModel(Model):
         self._iterator = iter(dataset)
     
     def _train_iteration(self):
-        for n in range(self._collect_steps_per_iteration):
-            if self._debugging:
-                with open("data/dqn_log.txt", "a") as f:
-                    f.write(f"collecting [step = {n}] ...\n")
-            self._collect_step(self._train_env, self._agent.collect_policy, self._repl_buffer)
+        self._collect_data(self._train_env, self._agent.collect_policy, self._repl_buffer, self._collect_steps_per_iteration)
         
         exp, _ = next(self._iterator)
         train_loss = self._agent.train(exp).loss
@@ -123,8 +136,7 @@ class TFAModel(Model):
 
         if step % self._log_interval == 0:
             if self._debugging:
-                with open("data/dqn_log.txt", "a") as f:
-                    f.write(f"step = {step}: loss = {train_loss}\n")
+                self._log_fh.write(f"step = {step}: loss = {train_loss}\n")
             self._log.append((f"step = {step}", f"loss = {train_loss}"))
         
         if step % self._eval_interval == 0:
@@ -137,6 +149,7 @@ class TFAModel(Model):
             raise Exception("Unbuilt replay buffer")
         
         self._agent.train = common.function(self._agent.train)
+        self._collect_step = common.function(self._collect_step)
 
         self._agent.train_step_counter.assign(0)
 
@@ -144,18 +157,24 @@ class TFAModel(Model):
 
         self._log, self._returns = [("Step = 0", f"Average Return = {avg_return}")], [avg_return]
 
-        if not self._debugging:
+        if self._debugging:
+            self._log_fh = open("data/dqn_log.txt", "a", buffering=1 << 16)
+        else:
             bar = st.progress(0.0, text=f"Training Model... (0/{self._num_iterations} Iterations Complete)")
-        for i in range(self._num_iterations):
-            if self._debugging:
-                with open("data/dqn_log.txt", "a") as f:
-                    f.write(f"iteration = [{i}]\n")
-            else:
-                if (i + 1) % self._eval_interval == 0:
-                    bar.progress(float((i + 1) / self._num_iterations), text=f"Evaluating Return... ({i + 1}/{self._num_iterations} Iterations Complete)")
+        try:
+            for i in range(self._num_iterations):
+                if self._debugging:
+                    self._log_fh.write(f"iteration = [{i}]\n")
                 else:
-                    bar.progress(float((i + 1) / self._num_iterations), text=f"Training Model... ({i + 1}/{self._num_iterations} Iterations Complete)")
-            self._train_iteration()
+                    if (i + 1) % self._eval_interval == 0:
+                        bar.progress(float((i + 1) / self._num_iterations), text=f"Evaluating Return... ({i + 1}/{self._num_iterations} Iterations Complete)")
+                    else:
+                        bar.progress(float((i + 1) / self._num_iterations), text=f"Training Model... ({i + 1}/{self._num_iterations} Iterations Complete)")
+                self._train_iteration()
+        finally:
+            if self._log_fh is not None:
+                self._log_fh.close()
+                self._log_fh = None
         if not self._debugging:
             bar.progress(1.0, text="Model Trained")
     
@@ -183,9 +202,13 @@ class TFAModel(Model):
     def train_returns(self):
         return self._returns
 
-    def calculate_npv(self):
-        self._npv = dqn_sim(self._agent.policy, self._eval_env, eps=self._n_sims, st_display=True)
-        self._priced = True
+    def calculate_npv(self, n_sims=None):
+        eps = self._n_sims if n_sims is None else n_sims
+        # the eval env is stepped in place, so sessions sharing one cached model have to take turns
+        with self._sim_lock:
+            self._npv = dqn_sim(self._agent.policy, self._eval_env, eps=eps, st_display=True)
+            self._priced = True
+            return self._npv
     
     @property 
     def npv(self):
@@ -194,11 +217,13 @@ class TFAModel(Model):
     def __str__(self):
         return f"Option Price (Deep Q-Network): ${self.npv}"
     
-    def st_visualize(self):
-        if not self._priced:
-            st.error("Option Not Yet Priced")
-            return
-        st.success(str(self))
+    def st_visualize(self, npv=None):
+        if npv is None:
+            if not self._priced:
+                st.error("Option Not Yet Priced")
+                return
+            npv = self.npv
+        st.success(f"Option Price (Deep Q-Network): ${npv}")
         st.divider()
         st.subheader("Train Iteration Log")
         st.dataframe(self.train_log, use_container_width=True)
@@ -0,0 +1,61 @@
+import torch
+import numpy as np
+import pandas as pd
+
+from dataclasses import dataclass, fields
+
+from models.black_scholes import _cdf, _pdf
+
+@dataclass
+class BatchedOption:
+    # one array per field (rather than one Option per contract) so a whole contract table prices in a single pass
+    spot: np.ndarray
+    strike: np.ndarray
+    time: np.ndarray
+    implied_volatility: np.ndarray
+    risk_free_rate: np.ndarray
+    dividend_rate: np.ndarray
+    flag: np.ndarray
+
+    def __len__(self):
+        return len(self.strike)
+
+    @classmethod
+    def from_contracts(cls, contracts: pd.DataFrame, spot, time_to_maturity, risk_free_rate, dividend_rate):
+        n = len(contracts)
+        iv = contracts["Implied Volatility"].str[:-1].str.replace(",", "").astype(np.float32).to_numpy() / 100
+
+        return cls(
+            spot=np.full(n, spot, dtype=np.float32),
+            strike=contracts["Strike"].to_numpy(dtype=np.float32),
+            time=np.full(n, time_to_maturity, dtype=np.float32),
+            implied_volatility=iv,
+            risk_free_rate=np.full(n, risk_free_rate, dtype=np.float32),
+            dividend_rate=np.full(n, dividend_rate, dtype=np.float32),
+            flag=np.where(contracts["Type"].to_numpy() == "C", 1, -1).astype(np.int8)
+        )
+
+    def tensors(self):
+        return {field.name: torch.as_tensor(getattr(self, field.name)) for field in fields(self)}
+
+def bs_price_and_greeks(batch: BatchedOption):
+    # one fused pass per row -> [price, delta, gamma, vega, theta, rho], sharing d1/d2 across every column.
+    # theta is d(price)/d(time to maturity), the same convention as the autograd greeks
+    batch = batch.tensors()
+    S, K, t, flag = batch["spot"], batch["strike"], batch["time"], batch["flag"]
+    r, d, sigma = batch["risk_free_rate"], batch["dividend_rate"], batch["implied_volatility"]
+    sqrt_t = torch.sqrt(t)
+    d_1 = (torch.log(S / K) + (r - d + torch.square(sigma) / 2) * t) / (sigma * sqrt_t)
+    d_2 = d_1 - sigma * sqrt_t
+
+    spot_pv, strike_pv = S * torch.exp(-d * t), K * torch.exp(-r * t)
+    n_1, n_2, pdf_1 = _cdf(flag * d_1), _cdf(flag * d_2), _pdf(d_1)
+
+    price = flag * (spot_pv * n_1 - strike_pv * n_2)
+    delta = flag * torch.exp(-d * t) * n_1
+    gamma = torch.exp(-d * t) * pdf_1 / (S * sigma * sqrt_t)
+    vega = spot_pv * pdf_1 * sqrt_t
+    theta = spot_pv * pdf_1 * sigma / (2 * sqrt_t) + flag * (r * strike_pv * n_2 - d * spot_pv * n_1)
+    rho = flag * t * strike_pv * n_2
+
+    return torch.stack([price, delta, gamma, vega, theta, rho], dim=1).numpy()
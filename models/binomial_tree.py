@@ -1,9 +1,27 @@
 import QuantLib as ql 
+import numpy as np
 import streamlit as st
 from datetime import date
 
 from models.abstract import Model
 
+def _crr_price(s, k, t, r, d, sigma, steps, flag, american=False):
+    dt = t / steps
+    u = np.exp(sigma * np.sqrt(dt))
+    p = (np.exp((r - d) * dt) - 1 / u) / (u - 1 / u)
+    disc = np.exp(-r * dt)
+
+    # only the current layer of the tree is kept; both buffers are overwritten in place on the backwards sweep
+    spots = s * u ** np.arange(-steps, steps + 1, 2, dtype=float)
+    values = np.maximum(flag * (spots - k), 0.0)
+    for i in range(steps - 1, -1, -1):
+        values[:i + 1] = disc * (p * values[1:i + 2] + (1 - p) * values[:i + 1])
+        if american:
+            spots[:i + 1] *= u
+            np.maximum(values[:i + 1], flag * (spots[:i + 1] - k), out=values[:i + 1])
+
+    return values[0]
+
 class BaseBinomialTree(Model):
     def __init__(self, origin: str, params):
         self._origin = origin
@@ -67,17 +85,9 @@ class BaseBinomialTree(Model):
             return None
         return self._price_dict["us"].NPV() - self._price_dict["eu"].NPV()
     
-    def _binomial_price(self, option, bsm_process, steps):
-        binomial_engine = ql.BinomialVanillaEngine(bsm_process, "crr", steps)
-        option.setPricingEngine(binomial_engine)
-        return option.NPV()
-
     def prices_over_time(self):
-        eu_prices=[]
-        for step in range(2, 200, 1):
-            eu_prices.append(self._binomial_price(self._price_dict["eu"], self.bsm, step))
-        
-        return eu_prices
+        _, k, s, sigma, r, d = self._option_data
+        return [_crr_price(s, k, self._time, r, d, sigma, step, self._flag) for step in range(2, 200, 1)]
     
     def st_visualize(self):
         st.success(str(self))
@@ -1,41 +1,42 @@
+import math
 import torch
-from torch.distributions import Normal
 
 import streamlit as st
 import pandas as pd
 
 from models.abstract import Model
 
+SQRT_2 = math.sqrt(2)
+SQRT_2PI = math.sqrt(2 * math.pi)
+
+def _cdf(x):
+    return 0.5 * (1 + torch.erf(x / SQRT_2))
+
+def _pdf(x):
+    return torch.exp(-torch.square(x) / 2) / SQRT_2PI
+
+def _bs_price(S, K, t, r, d, sigma, flag):
+    # elementwise over broadcastable tensors, so a whole contract table prices in one call
+    # flag is +1 for calls and -1 for puts, which keeps the formula branch-free
+    flag = torch.as_tensor(flag)
+    sigma_t = sigma * torch.sqrt(t)
+    d_1 = (torch.log(S / K) + (r - d + torch.square(sigma) / 2) * t) / sigma_t
+    d_2 = d_1 - sigma_t
+
+    spot_pv, strike_pv = S * torch.exp(-d * t), K * torch.exp(-r * t)
+    return flag * (_cdf(flag * d_1) * spot_pv - _cdf(flag * d_2) * strike_pv)
+
 class BlackScholes(Model):
     def __init__(self, params):
         super().__init__(params, with_tensors=True, name="Black Scholes")
 
-        self._cdf = Normal(0,1).cdf
-        self._pdf = lambda x: Normal(0,1).log_prob(x).exp()
-
     @property
     def npv(self):
-        d_1 = (1 / (self._iv * torch.sqrt(self._time))) * (torch.log(self._spot / self._strike) + (self._r + (torch.square(self._iv) / 2)) * self._time)
-        d_2 = d_1 - self._iv * torch.sqrt(self._time)
-        
-        if self._option_type == "P":
-            P = self._cdf(d_1) * self._spot - self._cdf(d_2) * self._strike * torch.exp(-self._r * self._time)
-            return P
-            
-        elif self._option_type == "C":
-            C = self._cdf(-d_2) * self._strike * torch.exp(-self._r * self._time) - self._cdf(-d_1) * self._spot
-            return C
+        return _bs_price(self._spot, self._strike, self._time, self._r, self._d, self._iv, self._flag)
 
     @property
     def greeks(self):
-        npv = self.npv
-        npv.backward()
-        return {
-            "delta": self._spot.grad,
-            "rho" : self._r.grad,
-            "vega" : self._iv.grad,
-            "theta" : self._time.grad,
-        }
+        return self._tensor_greeks(self.npv)
 
     def st_visualize(self):
         st.success(str(self))
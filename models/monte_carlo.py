@@ -10,6 +10,9 @@ class MonteCarlo(Model):
         super().__init__(params, with_tensors=True, name="Monte Carlo")
         self._region = region
         self._plot = None
+        self._npv, self._greeks = None, None
+
+        self._rng = torch.Generator().manual_seed(42)
     
     def _euo_plot(self, prices):
         data = prices.detach().numpy()
@@ -32,49 +35,56 @@ class MonteCarlo(Model):
         plt.axhline(y=100, color='g', linestyle="--")
         return fig
 
-    @property
-    def npv(self):
-        torch.manual_seed(42)
+    def _draw_normals(self):
         scenarios = 1000000 if self._region == "eu" else 100_000
+        shape = (scenarios,) if self._region == "eu" else (scenarios, max(int(self._time * 252), 1))
+        z = torch.empty(shape, dtype=torch.float32)
+
+        # antithetic variates: sample the first half of the scenarios, mirror them into the second
+        half = scenarios // 2
+        z[:half].normal_(generator=self._rng)
+        torch.neg(z[:half], out=z[half:])
+        return z
+
+    def _paths(self, z):
+        drift = self._r - self._d - self._iv * self._iv / 2
 
         if self._region == "eu":
-            w_t = torch.sqrt(self._time) * torch.randn(size=(scenarios,)) #Brownian Motion
-        else:
-            dt = torch.tensor(1 / 252)
-            w_t = torch.cumsum(torch.sqrt(dt) * torch.randn([scenarios, int(self._time * 252)]), 1)
+            return self._spot * torch.exp(drift * self._time + self._iv * torch.sqrt(self._time) * z)
 
-        dW = self._iv * w_t
-        prices = self._spot * torch.exp((self._r - self._d - self._iv * self._iv / 2) * self._time + dW)
+        dt = self._time / z.shape[1]
+        # whole (scenarios, n_steps) GBM trajectory in one pass: cumsum of log-returns == cumprod of growth factors
+        return self._spot * torch.exp(torch.cumsum(drift * dt + self._iv * torch.sqrt(dt) * z, 1))
+
+    def _simulate(self):
+        prices = self._paths(self._draw_normals())
 
         if self._region == "eu":
             self._plot = self._euo_plot(prices)
-            if self._option_type == "P":
-                payoff = torch.max(self._strike - prices, torch.zeros(size=(scenarios,)))
-            else:
-                payoff = torch.max(prices - self._strike, torch.zeros(size=(scenarios,)))
+            underlying = prices
         else:
             self._plot = self._aso_plot(prices)
-            if self._option_type == "P":
-                payoff = torch.max(self._strike - torch.mean(prices, axis=1), torch.zeros(scenarios))
-            else:
-                payoff = torch.max(torch.mean(prices, axis=1) - self._strike, torch.zeros(scenarios))
+            underlying = torch.mean(prices, axis=1)
+
+        payoff = torch.clamp((underlying - self._strike) * self._flag, min=0)
 
         return torch.mean(payoff) * torch.exp(-self._r*self._time)
     
+    @property
+    def npv(self):
+        if self._npv is None:
+            self._npv = self._simulate()
+        return self._npv
+
     @property
     def plot(self):
         return self._plot
     
     @property
     def greeks(self):
-        ov = self.npv
-        ov.backward()
-        return {
-            "delta": self._spot.grad,
-            "rho": self._r.grad,
-            "vega": self._iv.grad,
-            "theta": self._time.grad,
-        }
+        if self._greeks is None:
+            self._greeks = self._tensor_greeks(self.npv)
+        return self._greeks
 
     def st_visualize(self):
         st.success(str(self))
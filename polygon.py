@@ -7,7 +7,7 @@ from yahoo_fin import options
 from datetime import datetime
 
 from utils.tickers import read_tickers
-from utils.db_wrapper import clear_table, add_rows
+from utils.db_wrapper import clear_table, add_rows, write_parquet
 
 class Polygon:
     _headers: dict
@@ -174,6 +174,7 @@ class Polygon:
             current_stock_prices = self._get_eod_stock_prices(tickers)
 
         add_rows(eod_data, current_stock_prices)
+        write_parquet()
     
     def get_ticker_contracts_given_exp(self, ticker, expiration: str):
         scrape_methods = {True: self._yf_ticker_contracts, False: self._poly_ticker_contracts}
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from dataclasses import replace
+
+from models.batched import BatchedOption, bs_price_and_greeks
+
+CONTRACTS = pd.DataFrame({
+    "Strike": [95.0, 105.0],
+    "Implied Volatility": ["30.00%", "1,25.00%"],
+    "Type": ["C", "P"],
+})
+
+def _batch():
+    return BatchedOption(
+        spot=np.array([100.0, 100.0]),
+        strike=np.array([95.0, 105.0]),
+        time=np.array([0.7, 0.7]),
+        implied_volatility=np.array([0.3, 0.25]),
+        risk_free_rate=np.array([0.05, 0.05]),
+        dividend_rate=np.array([0.02, 0.02]),
+        flag=np.array([1, -1], dtype=np.int8)
+    )
+
+def _price(batch, field, bump):
+    bumped = replace(batch, **{field: getattr(batch, field) + bump})
+    return bs_price_and_greeks(bumped)[:, 0]
+
+def test_from_contracts_parses_table():
+    batch = BatchedOption.from_contracts(CONTRACTS, 100.0, 0.7, 0.05, 0.02)
+
+    np.testing.assert_array_equal(batch.flag, [1, -1])
+    np.testing.assert_allclose(batch.implied_volatility, [0.30, 1.25], rtol=1e-6)
+    np.testing.assert_allclose(batch.strike, [95.0, 105.0])
+    np.testing.assert_allclose(batch.time, [0.7, 0.7], rtol=1e-6)
+    assert bs_price_and_greeks(batch).shape == (2, 6)
+
+def test_greeks_match_finite_differences():
+    batch, h = _batch(), 1e-4
+    price, delta, gamma, vega, theta, rho = bs_price_and_greeks(batch).T
+
+    central = lambda field: (_price(batch, field, h) - _price(batch, field, -h)) / (2 * h)
+    second = (_price(batch, "spot", 1e-2) - 2 * price + _price(batch, "spot", -1e-2)) / 1e-4
+
+    np.testing.assert_allclose(delta, central("spot"), rtol=1e-5)
+    np.testing.assert_allclose(gamma, second, rtol=1e-3)
+    np.testing.assert_allclose(vega, central("implied_volatility"), rtol=1e-5)
+    np.testing.assert_allclose(theta, central("time"), rtol=1e-5)
+    np.testing.assert_allclose(rho, central("risk_free_rate"), rtol=1e-5)
+
+def test_put_call_parity():
+    batch = replace(_batch(), strike=np.array([100.0, 100.0]), implied_volatility=np.array([0.3, 0.3]))
+    call, put = bs_price_and_greeks(batch)[:, 0]
+    forward = 100.0 * np.exp(-0.02 * 0.7) - 100.0 * np.exp(-0.05 * 0.7)
+    np.testing.assert_allclose(call - put, forward, rtol=1e-9)
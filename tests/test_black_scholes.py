@@ -0,0 +1,33 @@
+import math
+import torch
+
+from datetime import date, timedelta
+
+from models.black_scholes import BlackScholes, _bs_price
+
+# Hull, Options Futures & Other Derivatives: European call on an index paying a 3% dividend yield
+HULL = dict(S=930.0, K=900.0, t=2 / 12, r=0.08, d=0.03, sigma=0.2)
+
+def _price(flag, **kwargs):
+    args = {k: torch.tensor(v, dtype=torch.float64) for k, v in {**HULL, **kwargs}.items()}
+    return float(_bs_price(args["S"], args["K"], args["t"], args["r"], args["d"], args["sigma"], flag))
+
+def test_call_matches_reference_with_dividends():
+    assert abs(_price(1) - 51.83) < 5e-3
+
+def test_put_call_parity():
+    call, put = _price(1), _price(-1)
+    forward = HULL["S"] * math.exp(-HULL["d"] * HULL["t"]) - HULL["K"] * math.exp(-HULL["r"] * HULL["t"])
+    assert abs((call - put) - forward) < 1e-9
+
+def test_model_price_and_greeks():
+    params = dict(option_type="P", spot=HULL["S"], strike=HULL["K"], maturity=date.today() + timedelta(days=61),
+                  time_to_maturity=HULL["t"], implied_volatility=HULL["sigma"],
+                  risk_free_rate=HULL["r"], dividend_rate=HULL["d"])
+    model = BlackScholes(params)
+    assert abs(float(model.npv.detach()) - _price(-1)) < 1e-3
+
+    sigma_t = HULL["sigma"] * math.sqrt(HULL["t"])
+    d_1 = (math.log(HULL["S"] / HULL["K"]) + (HULL["r"] - HULL["d"] + HULL["sigma"] ** 2 / 2) * HULL["t"]) / sigma_t
+    put_delta = -math.exp(-HULL["d"] * HULL["t"]) * 0.5 * (1 + math.erf(-d_1 / math.sqrt(2)))
+    assert abs(float(model.greeks["delta"]) - put_delta) < 1e-4
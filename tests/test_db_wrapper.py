@@ -0,0 +1,27 @@
+import pandas as pd
+
+from datetime import datetime
+from notanorm import SqliteDb
+
+import utils.db_wrapper as db_wrapper
+
+def test_parquet_round_trip_keeps_fractional_strikes_and_dates(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_wrapper, "db", SqliteDb(str(tmp_path / "options.db")))
+    monkeypatch.setattr(db_wrapper, "PARQUET_PATH", str(tmp_path / "eod.parquet"))
+    db_wrapper.read_rows_of_ticker.clear()
+
+    db_wrapper._setup_db()
+    db_wrapper.add_row("AAPL", "O:AAPL240621C00182500", "call", "2024-06-21", 182.5, {"AAPL": 190.25})
+    db_wrapper.add_row("MSFT", "O:MSFT240621P00400000", "put", "2024-06-21", 400, {"MSFT": 410.0})
+
+    # first read migrates the sqlite table since no parquet copy exists yet
+    rows = db_wrapper.read_rows_of_ticker("O:AAPL240621C00182500")
+    assert len(rows) == 1
+    assert rows["strike_price"].iloc[0] == 182.5
+    assert rows["spot_price"].iloc[0] == 190.25
+    assert rows["expiration_date"].iloc[0] == pd.Timestamp(datetime(2024, 6, 21))
+
+    # a refresh rewrites the copy and invalidates the cached rows
+    db_wrapper.add_row("AAPL", "O:AAPL240621C00182500", "call", "2024-06-21", 182.5, {"AAPL": 191.0})
+    db_wrapper.write_parquet()
+    assert len(db_wrapper.read_rows_of_ticker("O:AAPL240621C00182500")) == 2
@@ -0,0 +1,28 @@
+import math
+import torch
+
+from datetime import date, timedelta
+
+from models.black_scholes import _bs_price
+from models.monte_carlo import EUMonteCarlo, ASMonteCarlo
+
+PARAMS = dict(option_type="C", spot=100.0, strike=100.0, maturity=date.today() + timedelta(days=365),
+              time_to_maturity=1.0, implied_volatility=0.2, risk_free_rate=0.05, dividend_rate=0.01)
+
+def test_eu_price_matches_black_scholes():
+    for flag in ("C", "P"):
+        mc = EUMonteCarlo({**PARAMS, "option_type": flag})
+        args = [torch.tensor(PARAMS[k], dtype=torch.float64) for k in
+                ("spot", "strike", "time_to_maturity", "risk_free_rate", "dividend_rate", "implied_volatility")]
+        exact = float(_bs_price(*args, 1 if flag == "C" else -1))
+        # 1M antithetic paths put the standard error around 0.01, so this is a few standard errors
+        assert abs(float(mc.npv.detach()) - exact) < 0.05
+
+def test_asian_terminal_mean_is_risk_neutral_forward():
+    mc = ASMonteCarlo(PARAMS)
+    with torch.no_grad():
+        terminal = mc._paths(mc._draw_normals())[:, -1]
+
+    forward = PARAMS["spot"] * math.exp((PARAMS["risk_free_rate"] - PARAMS["dividend_rate"]) * PARAMS["time_to_maturity"])
+    standard_error = float(terminal.std()) / math.sqrt(len(terminal))
+    assert abs(float(terminal.mean()) - forward) < 4 * standard_error
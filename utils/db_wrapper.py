@@ -1,13 +1,20 @@
 from notanorm import SqliteDb 
 from utils.tickers import read_tickers
 
+import os
 import yfinance as yf
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
 from datetime import datetime
 # from notanorm import MysqlDb 
 
 # accepts all the same parameters as sqlite3.connect
 db = SqliteDb("data/options_data.db")
+PARQUET_PATH = "data/eod.parquet"
+ROW_SCHEMA = pa.schema([("underlying_ticker", pa.string()), ("ticker", pa.string()), ("contract_type", pa.string()),
+                        ("expiration_date", pa.timestamp("us")), ("strike_price", pa.float64()), ("spot_price", pa.float64())])
 
 def _setup_db():
     db.query("create table options (underlying_ticker text, ticker text, contract_type text, expiration_date datetime, strike_price integer, spot_price float)")
@@ -23,8 +30,23 @@ def add_rows(dataframe : pd.DataFrame, price_dict=None):
     for _, row in dataframe.iterrows():
         add_row("options", row["underlying_ticker"], row["ticker"], row["contract_type"], row["expiration_date"], row["strike_price"], price_dict)
 
-def read_rows_of_ticker(con, ticker): 
-    return pd.read_sql_query(f"SELECT * FROM options WHERE ticker = {ticker}", con)
+def _dump_parquet():
+    # columnar copy of the options table; reads load only the requested columns with tickers dictionary-encoded
+    rows = pd.DataFrame([dict(row) for row in db.select("options")], columns=ROW_SCHEMA.names)
+    rows["expiration_date"] = pd.to_datetime(rows["expiration_date"]) # sqlite hands datetimes back as text
+    pq.write_table(pa.Table.from_pandas(rows, schema=ROW_SCHEMA, preserve_index=False), PARQUET_PATH)
+
+def write_parquet():
+    _dump_parquet()
+    read_rows_of_ticker.clear()
+
+@st.cache_data(ttl=86400)
+def read_rows_of_ticker(ticker, columns=None):
+    if not os.path.exists(PARQUET_PATH): # one-time migration from the sqlite table
+        _dump_parquet()
+    table = pq.read_table(PARQUET_PATH, columns=columns, filters=[("ticker", "=", ticker)],
+                          read_dictionary=["underlying_ticker", "ticker", "contract_type"])
+    return table.to_pandas()
 
 def read_rows(con): 
     return pd.read_sql_query(f"SELECT * FROM options", con)